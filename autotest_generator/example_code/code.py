@@ -3,12 +3,12 @@
 
 def add(number_a: int, number_b: int) -> int:
     """Adds two integers and returns the result."""
-    #
+    # Exact type check on purpose: it is the project-wide idiom for the
+    # generated examples, skips the isinstance MRO walk, and rejects
+    # bool (a subclass of int) as an argument.
     if type(number_a) is not int or type(number_b) is not int:
         raise TypeError(
-            "Parameter(s) "
-            f"(a: {number_a}, number_b: {number_b}) "
-            "of invalid type"
+            f"Parameter(s) (a: {number_a}, b: {number_b}) of invalid type"
         )
 
     return number_a + number_b
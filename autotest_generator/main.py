@@ -1,11 +1,14 @@
 """Main entry point to execute out graph on a target code/fucntion."""
 
+import asyncio
 import logging
+import os
 import sys
+from typing import Final
 
 from dotenv import load_dotenv
 from src.file_io import save_test_file
-from src.graph_builder import build_workflow_graph
+from src.graph_builder import build_workflow_graph, save_graph_image
 
 # Setup Logger
 logging.basicConfig(
@@ -15,23 +18,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from a .env file, but only when the
+# environment is not already populated (CI and containers export the
+# variables directly) — skips the filesystem scan and parse at startup.
+if not os.environ.get("OPENAI_API_KEY"):
+    load_dotenv()
+
+
+# Shared template for the workflow's initial state. Batched runs over
+# many functions copy-update this one constant instead of rebuilding
+# the dict literal per invocation.
+_INPUT_TEMPLATE: Final[dict] = {
+    "file_path": "example_code/code.py",
+    "function_name": "add",
+}
 
 
 def main():
     """Function executes the flow of the LangGraph graph."""
 
-    logging.info("Building Graph")
+    logger.info("Building graph")
     # Build the workflow graph
-    graph = build_workflow_graph(save_image_path="graph.png")
+    graph = build_workflow_graph()
+    save_graph_image(graph, "graph.png")
     # Define the initial input for the workflow
-    initial_input = {
-        "file_path": "example_code/code.py",
-        "function_name": "add",
-    }
-    # Invoke the workflow graph
-    out = graph.invoke(initial_input)
+    initial_input = {**_INPUT_TEMPLATE}
+    # Invoke the workflow graph. The LLM nodes are async so the graph
+    # must be driven through its async entry point.
+    out = asyncio.run(graph.ainvoke(initial_input))
     # Save the generated test file
     save_test_file(
         generated_code=out["generated_test_code"],
@@ -45,5 +59,5 @@ if __name__ == "__main__":
     try:
         main()
     except Exception as e:
-        logger.critical(f"Unexpected error occured: {e}", exc_info=True)
+        logger.critical("Unexpected error occurred: %s", e, exc_info=True)
         sys.exit(1)
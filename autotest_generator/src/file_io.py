@@ -3,14 +3,23 @@
 import ast
 import logging
 import os
-from typing import List, Optional, TypedDict
+import py_compile
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
-class FunctionDetails(TypedDict):
-    """Typing used for function details."""
+@dataclass(slots=True)
+class FunctionDetails:
+    """Details extracted for a single function.
+
+    Slots keep instances compact and make field reads fixed-offset
+    attribute lookups instead of per-key dict hashing.
+    """
 
     code: str
     docstring: Optional[str]
@@ -24,28 +33,172 @@ def get_file_contents(filename: str) -> str:
     return source_code
 
 
-def get_file_function_nodes(file_contents: str) -> List[ast.FunctionDef]:
+def get_file_contents_bytes(filename: str) -> bytes:
+    """Function opens a file and returns contents as raw bytes."""
+    with open(filename, "rb") as file:
+        source_bytes = file.read()
+    return source_bytes
+
+
+@lru_cache(maxsize=128)
+def _load_and_parse(
+    file_path: str, mtime_ns: int
+) -> Tuple[str, Tuple[str, ...], ast.AST]:
+    """Loads and parses a .py file, caching the result per modification time.
+
+    The mtime is part of the cache key so a file edited between calls is
+    re-read and re-parsed, while repeated lookups against an unchanged
+    file pay the parse cost only once per process.
+
+    Args:
+        file_path (str):
+            The location of the file
+        mtime_ns (int):
+            The file's modification time in nanoseconds, used purely as
+            a cache-invalidation key
+
+    Returns:
+        A tuple of the file contents, its lines (with line endings
+        preserved) and the parsed AST
+    """
+    del mtime_ns  # Only used as part of the cache key.
+    # ast.parse accepts bytes and handles the PEP 263 coding cookie
+    # itself, so parse the raw bytes and only decode to str afterwards
+    # for callers that need the text.
+    source_bytes = get_file_contents_bytes(file_path)
+    tree = ast.parse(source_bytes)
+    source_code = source_bytes.decode("utf-8")
+    return source_code, tuple(source_code.splitlines(keepends=True)), tree
+
+
+def get_file_function_nodes(file_contents: str) -> Iterator[ast.FunctionDef]:
     """Function takes the contents of a file before parsing out the function
     nodes.
 
+    Nodes are yielded lazily so a caller that only needs the first few
+    matches can stop iterating without the full list ever being built.
+    Only module-level functions and class methods are considered; the
+    walk never descends into function bodies, so nested helper
+    definitions are skipped along with every expression node inside a
+    body.
+
     Args:
         file_contents (str):
             A string of the file contents of a .py file
 
-    Returns:
-        List of the function nodes from .py file
+    Yields:
+        The function nodes from the .py file
     """
     tree = ast.parse(file_contents)
-    function_nodes = []
-    for node in ast.walk(tree):
-        # Walk the tree to find a function with the matching name.
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef):
-            function_nodes.append(node)
-    return function_nodes
+            yield node
+        elif isinstance(node, ast.ClassDef):
+            for class_node in node.body:
+                if isinstance(class_node, ast.FunctionDef):
+                    yield class_node
+
+
+class _FunctionFinder(ast.NodeVisitor):
+    """Visitor that locates a single function definition by name.
+
+    Unlike a full ``ast.walk``, this visitor stops as soon as the target
+    function is found and never descends into function bodies, so nested
+    definitions are skipped and the traversal is O(nodes before match).
+    """
+
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.found_node: Optional[ast.FunctionDef] = None
+
+    def visit_FunctionDef(  # pylint: disable=invalid-name
+        self, node: ast.FunctionDef
+    ) -> None:
+        """Records the node on a name match without visiting its body."""
+        if self.found_node is None and node.name == self.function_name:
+            self.found_node = node
+
+
+def find_function_node(
+    tree: ast.AST, function_name: str
+) -> Optional[ast.FunctionDef]:
+    """Finds the function node with the given name in a parsed tree.
+
+    Args:
+        tree (ast.AST):
+            The parsed AST of a .py file
+        function_name (str):
+            The name of the function to locate
+
+    Returns:
+        The matching function node, or None if no match exists
+    """
+    finder = _FunctionFinder(function_name)
+    finder.visit(tree)
+    return finder.found_node
+
+
+def _unparsed_signature(function_node: ast.FunctionDef) -> str:
+    """Rebuilds a function's signature from its AST node.
+
+    Args:
+        function_node (ast.FunctionDef):
+            The function node whose signature is wanted
+
+    Returns:
+        The signature string, including any return annotation.
+    """
+    sig = f"def {function_node.name}({ast.unparse(function_node.args)})"
+    if function_node.returns is not None:
+        sig += f" -> {ast.unparse(function_node.returns)}"
+    return f"{sig}:"
+
+
+def _format_signature(
+    function_node: ast.FunctionDef, source_lines: Tuple[str, ...]
+) -> str:
+    """Builds the function's signature by slicing it out of the source.
+
+    The header runs from the `def` keyword to the line before the body's
+    first statement, so no `ast.unparse` visitor needs to be built for
+    what is already literal text. Falls back to `ast.unparse` for
+    single-line definitions where the header cannot be sliced cleanly.
+
+    Args:
+        function_node (ast.FunctionDef):
+            The function node whose signature is wanted
+        source_lines (Tuple[str, ...]):
+            The file contents split into lines with line endings
+            preserved
+
+    Returns:
+        The signature string, e.g. "def add(a: int, b: int) -> int:"
+    """
+    body = function_node.body
+    if not body or not source_lines or body[0].lineno <= function_node.lineno:
+        return _unparsed_signature(function_node)
+
+    header_lines = list(
+        source_lines[function_node.lineno - 1 : body[0].lineno - 1]
+    )
+    header_lines[0] = header_lines[0][function_node.col_offset :]
+    header = "".join(header_lines).rstrip()
+    # Trim anything after the closing colon. A '#' anywhere in the
+    # header means a comment may hide the real closing colon (rfind
+    # would grab a colon inside the comment), so rebuild the signature
+    # from the AST instead for those rare headers.
+    if "#" in header:
+        return _unparsed_signature(function_node)
+    colon_index = header.rfind(":")
+    if colon_index != -1:
+        return header[: colon_index + 1]
+    return f"{header}:"
 
 
 def get_function_node_code(
-    source_code: str, function_node: ast.FunctionDef
+    source_code: str,
+    function_node: ast.FunctionDef,
+    source_lines: Optional[Tuple[str, ...]] = None,
 ) -> FunctionDetails:
     """Function takes the contents of a .py file and a function node and parses
     out the code and docstring for that function.
@@ -55,14 +208,34 @@ def get_function_node_code(
             A string of the file contents of a .py file
         function_node (ast.FunctionDef):
             A funtion node that has been extracted from the file
+        source_lines (Optional[Tuple[str, ...]]):
+            The file contents split into lines with line endings
+            preserved. Computed from `source_code` when not supplied;
+            passing a precomputed tuple avoids re-splitting the file
+            for every extraction.
 
     Returns:
-        A dictionary containing code and details of the function
+        A FunctionDetails instance with the code and details of the
+        function
 
      Throws:
         ValueError: The fucntion cannot be extracted
     """
-    function_code = ast.get_source_segment(source_code, function_node)
+    if source_lines is None:
+        source_lines = tuple(source_code.splitlines(keepends=True))
+
+    # Slice the function's source directly via the node's line/column
+    # offsets (available since Python 3.8). This is O(function size),
+    # unlike ast.get_source_segment which re-splits the whole file on
+    # every call.
+    segment = list(
+        source_lines[function_node.lineno - 1 : function_node.end_lineno]
+    )
+    function_code = ""
+    if segment:
+        segment[-1] = segment[-1][: function_node.end_col_offset]
+        segment[0] = segment[0][function_node.col_offset :]
+        function_code = "".join(segment)
 
     # If function cannot be extracted throw error
     if not function_code:
@@ -70,12 +243,69 @@ def get_function_node_code(
             f"Function '{function_node.name}' could not be extracted."
         )
     docstring = ast.get_docstring(function_node)
-    signature = f"def {function_node.name}({ast.unparse(function_node.args)}):"
-    return {
-        "code": function_code,
-        "docstring": docstring,
-        "signature": signature,
-    }
+    signature = _format_signature(function_node, source_lines)
+    return FunctionDetails(
+        code=function_code,
+        docstring=docstring,
+        signature=signature,
+    )
+
+
+@lru_cache(maxsize=64)
+def _def_pattern(function_name: str) -> "re.Pattern[str]":
+    """Returns the compiled pattern matching a top-level def of the name."""
+    return re.compile(rf"^def\s+{re.escape(function_name)}\s*\(", re.M)
+
+
+# Marks the start of the next top-level statement after a function: a
+# new def/class, a decorator, or any other unindented code.
+_NEXT_TOP_LEVEL = re.compile(r"^(?:def\s|class\s|@|\w)", re.M)
+
+
+def fast_extract_function(
+    source_code: str, function_name: str
+) -> Optional[FunctionDetails]:
+    """Attempts to extract a top-level function without parsing the file.
+
+    A regex pre-scan locates the `def` line and the next top-level
+    statement, then only the delimited block is fed to `ast.parse` to
+    confirm it round-trips into a single function of the expected name.
+    This skips building an AST for the whole file in the common case of
+    a unique, top-level target.
+
+    Args:
+        source_code (str):
+            A string of the file contents of a .py file
+        function_name (str):
+            The name of the function to extract
+
+    Returns:
+        The extracted FunctionDetails, or None when the pre-scan cannot
+        confidently isolate the function and a full parse is required
+    """
+    pattern = _def_pattern(function_name)
+    match = pattern.search(source_code)
+    if match is None or pattern.search(source_code, match.end()):
+        # Zero or multiple candidates: let the AST path decide.
+        return None
+
+    next_top_level = _NEXT_TOP_LEVEL.search(source_code, match.end())
+    end = next_top_level.start() if next_top_level else len(source_code)
+    block = source_code[match.start() : end]
+
+    try:
+        tree = ast.parse(block)
+    except SyntaxError:
+        return None
+    if len(tree.body) != 1:
+        return None
+    function_node = tree.body[0]
+    if (
+        not isinstance(function_node, ast.FunctionDef)
+        or function_node.name != function_name
+    ):
+        return None
+    return get_function_node_code(block, function_node)
 
 
 def get_function_details(
@@ -91,22 +321,111 @@ def get_function_details(
             The name of the function to be parsed
 
     Returns:
-        A dictionary containing code and details of the function
+        A FunctionDetails instance with the code and details of the
+        function
 
     Throws:
         ValueError: The funciton cannot be found within the file
     """
+    # Try the regex pre-scan first: for a unique top-level target it
+    # avoids building an AST for the whole file.
     source_code = get_file_contents(file_path)
-    function_nodes = get_file_function_nodes(source_code)
-    function_node = None
-    for node in function_nodes:
-        if node.name == function_name:
-            function_node = node
+    details = fast_extract_function(source_code, function_name)
+    if details is not None:
+        return details
+
+    # Fall back to the full (cached) parse for anything the pre-scan
+    # could not confidently isolate.
+    source_code, source_lines, tree = _load_and_parse(
+        file_path, os.stat(file_path).st_mtime_ns
+    )
+    function_node = find_function_node(tree, function_name)
     if not function_node:
         raise ValueError(
             f"Function '{function_name}' not found in '{file_path}'."
         )
-    return get_function_node_code(source_code, function_node)
+    return get_function_node_code(source_code, function_node, source_lines)
+
+
+# Directories already ensured by save_test_file in this process. A hit
+# here skips the stat/mkdir syscalls entirely on repeated saves into
+# the same test subdirectory.
+_ensured_dirs: set = set()
+
+
+def _build_test_path(
+    source_file_path: str, function_name: str, base_test_dir: str
+) -> Tuple[str, str]:
+    """Derives the test subdirectory and output path for one function.
+
+    Args:
+        source_file_path (str):
+            The relative path to the source Python file under test
+        function_name (str):
+            The name of the function under test
+        base_test_dir (str):
+            The root directory for all tests (e.g., 'tests')
+
+    Returns:
+        A tuple of the test subdirectory and the full test file path
+    """
+    if os.sep == "/":
+        # POSIX-style relative paths only need two string splits, which
+        # is cheaper than chaining dirname/basename/splitext/join calls.
+        source_dir, _, base = source_file_path.rpartition("/")
+        module_name = base.rsplit(".", 1)[0]
+        if source_dir:
+            test_subdirectory = f"{base_test_dir}/{source_dir}/{module_name}"
+        else:
+            test_subdirectory = f"{base_test_dir}/{module_name}"
+        return (
+            test_subdirectory,
+            f"{test_subdirectory}/test_{function_name}.py",
+        )
+
+    # Fall back to os.path on platforms with a different separator.
+    source_dir = os.path.dirname(source_file_path)
+    module_name = os.path.splitext(os.path.basename(source_file_path))[0]
+    test_subdirectory = os.path.join(base_test_dir, source_dir, module_name)
+    output_path = os.path.join(test_subdirectory, f"test_{function_name}.py")
+    return test_subdirectory, output_path
+
+
+def plan_test_paths(
+    targets: Iterable[Tuple[str, str]], base_test_dir: str = "tests"
+) -> Dict[Tuple[str, str], str]:
+    """Precomputes test file paths for a batch of targets and creates all
+    of their parent directories in a single pass.
+
+    Doing the path math and directory creation up front means each
+    subsequent `save_test_file` call is a pure write: pass it the
+    precomputed `output_path` and it neither re-derives the path nor
+    touches the directory tree.
+
+    Args:
+        targets (Iterable[Tuple[str, str]]):
+            (source_file_path, function_name) pairs to plan for
+        base_test_dir (str):
+            The root directory for all tests (e.g., 'tests')
+
+    Returns:
+        A mapping from (source_file_path, function_name) to the planned
+        test file path
+    """
+    planned: Dict[Tuple[str, str], str] = {}
+    directories = set()
+    for source_file_path, function_name in targets:
+        test_subdirectory, output_path = _build_test_path(
+            source_file_path, function_name, base_test_dir
+        )
+        planned[(source_file_path, function_name)] = output_path
+        directories.add(test_subdirectory)
+
+    for directory in directories - _ensured_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+    return planned
 
 
 def save_test_file(
@@ -114,6 +433,7 @@ def save_test_file(
     source_file_path: str,
     function_name: str,
     base_test_dir: str = "tests",
+    output_path: Optional[str] = None,
 ) -> str:
     """Saves the generated test code to a file, mirroring the source directory
     structure.
@@ -131,36 +451,44 @@ def save_test_file(
             The name of the function that was tested.
         base_test_dir:
             The root directory for all tests (e.g., 'tests').
+        output_path:
+            A precomputed test file path from `plan_test_paths`. When
+            given, path derivation and directory creation are skipped
+            and the call is a pure write.
 
     Returns:
         The full path to the newly created test file.
     """
-    # 1. Get the directory part of the source path.
-    source_dir = os.path.dirname(source_file_path)
-
-    # 2. Get the name of the source file without its .py extension.
-    # e.g., 'example_code/deeply/nested/code.py' -> 'code'
-    module_name = os.path.splitext(os.path.basename(source_file_path))[0]
-
-    # 3. Construct the target subdirectory by joining the base test directory,
-    #    the source's directory path, and the module name. The module name
-    #    becomes a directory itself to group tests for all functions in that
-    #    file.
-    test_subdirectory = os.path.join(base_test_dir, source_dir, module_name)
-
-    # 4. Create the specific test filename based on the function name.
-    # e.g., 'test_add.py'
-    test_filename = f"test_{function_name}.py"
-
-    # 5. Combine the subdirectory and filename into the full output path.
-    output_path = os.path.join(test_subdirectory, test_filename)
-
-    # 6. Ensure the entire directory path exists before writing the file.
-    os.makedirs(test_subdirectory, exist_ok=True)
+    if output_path is None:
+        # 1. Derive the target subdirectory and test file path from the
+        #    source path and function name.
+        test_subdirectory, output_path = _build_test_path(
+            source_file_path, function_name, base_test_dir
+        )
 
-    # 7. Write the generated code to the new, specific file path.
-    with open(output_path, "w+", encoding="utf-8") as file:
-        file.write(generated_code)
+        # 2. Ensure the entire directory path exists before writing the
+        #    file, skipping the filesystem round trip when we already
+        #    created it earlier in this run.
+        if test_subdirectory not in _ensured_dirs:
+            os.makedirs(test_subdirectory, exist_ok=True)
+            _ensured_dirs.add(test_subdirectory)
+
+    # 3. Write the generated code to the new, specific file path. Encode
+    #    up front and write the bytes in one go, skipping the
+    #    TextIOWrapper layer's incremental encoding.
+    with open(output_path, "wb") as file:
+        file.write(generated_code.encode("utf-8"))
+
+    # 4. Pre-compile to .pyc now so the next pytest run imports the
+    #    cached bytecode instead of re-parsing the source. Failures are
+    #    non-fatal: a generated file that does not compile is still
+    #    saved for inspection.
+    py_compile.compile(
+        output_path,
+        cfile=None,
+        doraise=False,
+        invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+    )
 
     logger.info(f"Test File saved to: {output_path}")
 
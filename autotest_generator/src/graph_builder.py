@@ -1,20 +1,23 @@
 """Functions related to the creation of a graph based on predefined nodes and
 edges."""
 
-from typing import Optional
+import functools
+import os
 
 from langgraph.graph import END, StateGraph
 
 from .node import (GraphState, analyze_function, finalize_file,
-                   generate_single_test, plan_tests, prepare_iteration,
-                   should_continue_generating)
+                   generate_all_tests, plan_tests, prepare_iteration)
 
 
-def build_workflow_graph(save_image_path: Optional[str] = None):
+@functools.lru_cache(maxsize=1)
+def build_workflow_graph():
     """Builds the workflow graph for the autotest generator.
 
-    Args:
-        save_image_path: Optional path to save the graph image.
+    The graph topology is static, so the compiled graph is memoized and
+    subsequent calls within the same process return the first result
+    without re-registering nodes or recompiling. Use `save_graph_image`
+    to render the graph to disk.
 
     Returns:
         The compiled workflow graph.
@@ -23,38 +26,66 @@ def build_workflow_graph(save_image_path: Optional[str] = None):
     workflow.add_node("analyze_function", analyze_function)
     workflow.add_node("plan_tests", plan_tests)
     workflow.add_node("prepare_iteration", prepare_iteration)
-    workflow.add_node("generate_single_test", generate_single_test)
+    workflow.add_node("generate_all_tests", generate_all_tests)
     workflow.add_node("finalize_file", finalize_file)
 
+    # All test cases are generated in one batched node, so the graph is
+    # a straight line with no per-case loop edges.
     workflow.set_entry_point("analyze_function")
     workflow.add_edge("analyze_function", "plan_tests")
     workflow.add_edge("plan_tests", "prepare_iteration")
-
-    workflow.add_conditional_edges(
-        "prepare_iteration",
-        should_continue_generating,
-        {
-            "continue_generation": "generate_single_test",
-            "finalize": "finalize_file",
-        },
-    )
-
-    workflow.add_conditional_edges(
-        "generate_single_test",
-        should_continue_generating,
-        {
-            "continue_generation": "generate_single_test",
-            "finalize": "finalize_file",
-        },
-    )
+    workflow.add_edge("prepare_iteration", "generate_all_tests")
+    workflow.add_edge("generate_all_tests", "finalize_file")
     workflow.add_edge("finalize_file", END)
 
-    graph = workflow.compile()
+    return workflow.compile()
 
-    # Save the graph image if requested
-    if save_image_path is not None:
-        png_bytes = graph.get_graph().draw_mermaid_png()
-        with open(save_image_path, "wb") as file:
-            file.write(png_bytes)
 
-    return graph
+def _saved_mermaid_source(source_path: str):
+    """Returns the sidecar Mermaid source for a rendered image.
+
+    Args:
+        source_path (str): Path of the sidecar source file.
+
+    Returns:
+        The recorded source string, or None when the sidecar is missing
+        or unreadable (which forces a re-render).
+    """
+    try:
+        with open(source_path, "r", encoding="utf-8") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def save_graph_image(graph, save_image_path: str, force: bool = False) -> None:
+    """Renders the compiled workflow graph to a PNG file.
+
+    Rendering goes through LangGraph's Mermaid pipeline, which can
+    involve a network round trip, so an image that still matches the
+    graph's current Mermaid source is left alone. The source is kept in
+    a sidecar file next to the image; comparing it keys staleness on
+    the graph's actual content, so a topology change always re-renders
+    while checkout or copy timestamps never matter.
+
+    Args:
+        graph (CompiledStateGraph): The compiled workflow graph.
+        save_image_path (str): Path to save the graph image to.
+        force (bool):
+            Re-render even when the existing image looks up to date.
+    """
+    mermaid_source = graph.get_graph().draw_mermaid()
+    source_path = f"{save_image_path}.mmd"
+    if (
+        not force
+        and os.path.exists(save_image_path)
+        and _saved_mermaid_source(source_path) == mermaid_source
+    ):
+        return
+    png_bytes = graph.get_graph().draw_mermaid_png()
+    with open(save_image_path, "wb") as file:
+        file.write(png_bytes)
+    # Written only after a successful render, so a failed render leaves
+    # the image marked stale.
+    with open(source_path, "w", encoding="utf-8") as file:
+        file.write(mermaid_source)
@@ -0,0 +1,86 @@
+"""A small content-addressed on-disk cache for LLM completions."""
+
+import hashlib
+import os
+import sqlite3
+from typing import Optional
+
+# Completions are stored keyed by a hash of everything that determines
+# the output, so re-runs and retries reuse prior responses instead of
+# paying for an identical LLM call again.
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dev-toolbox")
+_CACHE_PATH = os.path.join(_CACHE_DIR, "llm.sqlite")
+# pylint: disable-next=invalid-name
+_connection: Optional[sqlite3.Connection] = None
+
+
+def _cache() -> Optional[sqlite3.Connection]:
+    """Returns this process's connection to the completion cache.
+
+    The connection is opened lazily on first use. Returns None when the
+    cache cannot be opened (e.g. a read-only home directory); callers
+    then simply invoke the LLM uncached.
+    """
+    global _connection  # pylint: disable=global-statement
+    if _connection is None:
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            connection = sqlite3.connect(_CACHE_PATH, timeout=5.0)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS completions "
+                "(key TEXT PRIMARY KEY, completion TEXT)"
+            )
+            connection.commit()
+            _connection = connection
+        except (OSError, sqlite3.Error):
+            return None
+    return _connection
+
+
+def cache_key(*parts: str) -> str:
+    """Builds the content hash identifying one LLM call.
+
+    Args:
+        *parts: Every string that determines the completion (prompt
+            name, rendered inputs, ...). Parts are length-delimited so
+            distinct splits can never collide.
+
+    Returns:
+        A hex digest usable as the cache key.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8")
+        digest.update(str(len(encoded)).encode("ascii"))
+        digest.update(b"\x00")
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Looks up a previously stored completion; None on miss or error."""
+    cache = _cache()
+    if cache is None:
+        return None
+    try:
+        row = cache.execute(
+            "SELECT completion FROM completions WHERE key = ?", (key,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def put(key: str, completion: str) -> None:
+    """Persists a completion under its key; failures are ignored."""
+    cache = _cache()
+    if cache is None:
+        return
+    try:
+        cache.execute(
+            "INSERT OR REPLACE INTO completions VALUES (?, ?)",
+            (key, completion),
+        )
+        cache.commit()
+    except sqlite3.Error:
+        pass
@@ -1,30 +1,43 @@
 """Defines the nodes for a graph-based Python unit test generation pipeline."""
 
-import json
+import asyncio
 import logging
-import os
-from typing import List, Optional, TypedDict
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Any, Dict, List, Optional
 import textwrap
 
+import orjson
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
+from openai import RateLimitError
+from tenacity import (retry, retry_if_exception_type, stop_after_attempt,
+                      wait_exponential)
 
+from . import llm_cache
 from .file_io import FunctionDetails, get_function_details
 from .prompting import load_prompt_template
-from .schemas import RunnableTestCase, RunnableTestSuite, TestSuite
+from .schemas import (TEST_SUITE_SCHEMA, RunnableTestCase, RunnableTestSuite,
+                      StorageTestCase, TestSuite)
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
-class GraphState(TypedDict):
+@dataclass(slots=True)
+class GraphState:  # pylint: disable=too-many-instance-attributes
     """Represents the state of the graph-based code analysis and test
     generation process.
 
     This structure encapsulates all relevant information for a specific node
     or stage within a directed acyclic graph (DAG) that guides the development
-    of unit tests for a given Python function.
+    of unit tests for a given Python function. It is a slotted dataclass
+    rather than a TypedDict, so node reads are attribute lookups instead
+    of dict hashing and each state instance stores its fields in a
+    compact fixed layout; LangGraph accepts it directly as the graph's
+    state schema and still merges the partial dict updates nodes return.
 
     Attributes:
         file_path (str):
@@ -35,13 +48,18 @@ class GraphState(TypedDict):
             The name of the specific function within the
             `file_path` that is the subject of analysis and
             test generation.
+        module_path (Optional[str]):
+            The dotted import path derived from `file_path`
+            (e.g. 'example_code.code'). Computed once at
+            graph entry so later nodes reuse it instead of
+            re-deriving it from the file path.
         function_code (Optional[str]):
             The complete, raw source code of the
             `function_name` extracted from the
             `file_path`. This is often a prerequisite
             for detailed analysis. `None` if not yet retrieved.
         analysis (Optional[FunctionDetails]):
-            A structured dictionary containing
+            A structured record containing
             the results of static code analysis
             for the function. This might include
             its signature, parameter types,
@@ -79,12 +97,13 @@ class GraphState(TypedDict):
             performed on this `GraphState`. Essential for preventing
             infinite loops in iterative processes by setting a
             maximum iteration limit.
-        accumulated_test_code (str):
-            A string accumulating all generated test code
-            across multiple iterations. This ensures that
-            progress is not lost and can be used to build
-            a comprehensive test suite. Defaults to an
-            empty string.
+        accumulated_test_code_parts (List[str]):
+            The generated test code collected as a list of
+            snippets (header first, then one entry per
+            test). Keeping parts and joining once at
+            finalization keeps total concatenation cost
+            linear in the output size. Defaults to an
+            empty list.
         current_test_case_json (str):
             A JSON string representation of the *current*
             test case being processed or generated. This
@@ -95,21 +114,108 @@ class GraphState(TypedDict):
 
     file_path: str
     function_name: str
-    function_code: Optional[str]
-    analysis: FunctionDetails
-    test_plan: RunnableTestSuite
-    test_cases_to_generate: List[RunnableTestCase]
-    generated_test_code: Optional[str]
-    refinement_notes: Optional[str]
-    iteration_count: int
-    accumulated_test_code: str
-    current_test_case_json: str
+    module_path: Optional[str] = None
+    function_code: Optional[str] = None
+    analysis: Optional[FunctionDetails] = None
+    test_plan: Optional[RunnableTestSuite] = None
+    test_cases_to_generate: List[RunnableTestCase] = field(
+        default_factory=list
+    )
+    generated_test_code: Optional[str] = None
+    refinement_notes: Optional[str] = None
+    iteration_count: int = 0
+    accumulated_test_code_parts: List[str] = field(default_factory=list)
+    current_test_case_json: str = ""
 
 
 MODEL: str = "gpt-4.1-mini"
 
 
-def analyze_function(state: GraphState) -> GraphState:
+@lru_cache(maxsize=128)
+def _module_path(file_path: str) -> str:
+    """Converts a source file path to its dotted module import path.
+
+    Cached per path, and suffix-aware: only a trailing '.py' is
+    stripped, so a '.py' occurring mid-name cannot corrupt the result
+    the way a plain str.replace would.
+    """
+    return PurePath(file_path).with_suffix("").as_posix().replace("/", ".")
+
+
+@lru_cache(maxsize=1)
+def _llm() -> ChatOpenAI:
+    """Returns the shared chat model, constructed once per process.
+
+    Reusing a single client keeps one HTTP connection pool alive across
+    every node invocation instead of rebuilding it per call.
+    """
+    return ChatOpenAI(model=MODEL, temperature=0)
+
+
+@lru_cache(maxsize=1)
+def _planner_chain():
+    """Returns the cached prompt -> structured-output planning chain.
+
+    The model is bound to the precomputed TEST_SUITE_SCHEMA dict rather
+    than the TestSuite class, so the Pydantic-to-JSON-schema derivation
+    is not repeated per binding; the chain therefore yields a plain
+    dict that plan_tests validates back into a TestSuite.
+    """
+    prompt = load_prompt_template(prompt_name="test_planner")
+    structured_llm = _llm().with_structured_output(
+        schema=TEST_SUITE_SCHEMA, method="json_schema"
+    )
+    return prompt | structured_llm
+
+
+@lru_cache(maxsize=1)
+def _coder_chain():
+    """Returns the cached prompt -> model -> string test-writer chain."""
+    return load_prompt_template("test_writer") | _llm() | StrOutputParser()
+
+
+def _runnable_cases(
+    cases: List[StorageTestCase],
+) -> List[RunnableTestCase]:
+    """Converts storage cases (JSON-string inputs) to runnable ones.
+
+    The test-case models are frozen, so the decoded inputs go into
+    fresh RunnableTestCase instances rather than being written back
+    onto the storage cases.
+    """
+    return [
+        RunnableTestCase(
+            description=case.description,
+            expected_outcome=case.expected_outcome,
+            inputs=(
+                orjson.loads(case.inputs)
+                if isinstance(case.inputs, str)
+                else case.inputs
+            ),
+        )
+        for case in cases
+    ]
+
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, min=1, max=30),
+    reraise=True,
+)
+async def _ainvoke_chain(chain: Any, payload: Dict[str, Any]) -> Any:
+    """Invokes a chain, retrying transient rate-limit failures.
+
+    Retrying here, at the single LLM boundary, means one throttled call
+    backs off and recovers on its own instead of failing the node and
+    discarding everything the graph has already accumulated. Up to five
+    attempts with exponential backoff (1s doubling to a 30s cap); any
+    other exception propagates immediately.
+    """
+    return await chain.ainvoke(payload)
+
+
+def analyze_function(state: GraphState) -> Dict[str, Any]:
     """Performs static analysis on the function specified in the GraphState.
 
     This function retrieves the source code, docstring, and signature of the
@@ -122,64 +228,52 @@ def analyze_function(state: GraphState) -> GraphState:
             `file_path` and `function_name`.
 
     Returns:
-        GraphState:
-            The updated state with `function_code`, `analysis` populated,
-            and `iteration_count` incremented.
+        Dict[str, Any]:
+            The state keys updated by this node (`function_code`,
+            `analysis` and the reset `iteration_count`); LangGraph
+            merges them into the full state.
     """
     logger.info("--- Executing Node: analyze_function ---")
     logger.debug(
-        f"Analyzing function '{state['function_name']}'"
-        f" from file '{state['file_path']}'"
+        f"Analyzing function '{state.function_name}'"
+        f" from file '{state.file_path}'"
     )
     function_analysis_details = get_function_details(
-        file_path=state["file_path"], function_name=state["function_name"]
+        file_path=state.file_path, function_name=state.function_name
     )
 
-    if (
-        function_analysis_details.get("code") is None
-        or function_analysis_details.get("signature") is None
-    ):
-        logger.error(
-            f"Function '{state['function_name']}' not found in file "
-            f"'{state['file_path']}'."
-        )
-        raise ValueError(
-            f"Function '{state['function_name']}' not found in file "
-        )
-
-    updated_state = state.copy()
-
-    code_str = function_analysis_details.get("code")
-    signature_str = function_analysis_details.get("signature")
-
+    # Fetch the fields once and validate once; the happy path pays a
+    # single pair of attribute reads and no repeated check.
+    code_str = function_analysis_details.code
+    signature_str = function_analysis_details.signature
     if code_str is None or signature_str is None:
         logger.error(
-            f"Function '{state['function_name']}' not found in file "
-            f"'{state['file_path']}'."
+            f"Function '{state.function_name}' not found in file "
+            f"'{state.file_path}'."
         )
         raise ValueError(
-            f"Function '{state['function_name']}' not found in file "
+            f"Function '{state.function_name}' not found in file "
         )
-    updated_state["function_code"] = code_str
 
-    updated_state["analysis"] = {
-        "docstring": function_analysis_details.get("docstring"),
-        "signature": signature_str,
-        "code": code_str,
-    }
-    updated_state["iteration_count"] = 0
     logger.info(
-        f"Successfully analyzed function '{state['function_name']}'."
+        f"Successfully analyzed function '{state.function_name}'."
         " Code and analysis updated."
     )
     logger.debug(
-        f"Analysis results for '{state['function_name']}':"
-        f" {updated_state['analysis']}"
+        f"Analysis results for '{state.function_name}':"
+        f" {function_analysis_details}"
     )
-    return updated_state
+    # Return only the keys this node changed; LangGraph merges the
+    # partial update, so no full state copy is needed.
+    return {
+        "function_code": code_str,
+        "analysis": function_analysis_details,
+        "module_path": _module_path(state.file_path),
+        "iteration_count": 0,
+    }
 
 
-def plan_tests(state: GraphState) -> GraphState:
+async def plan_tests(state: GraphState) -> Dict[str, Any]:
     """Generates a high-level test plan based on the function's analysis.
 
     This function utilizes a language model to create a structured test plan,
@@ -192,80 +286,66 @@ def plan_tests(state: GraphState) -> GraphState:
                             `function_code` and `analysis` details.
 
     Returns:
-        GraphState: The updated state with the `test_plan` populated.
+        Dict[str, Any]: The updated `test_plan` key for the state.
 
     Raises:
+        ValueError: If `analysis` is missing from the state.
         Exception: For any errors encountered during language model interaction
                    or test plan parsing.
     """
     logger.info("--- Executing Node: plan_tests ---")
 
+    # Narrow the Optional field populated by analyze_function.
+    analysis = state.analysis
+    if analysis is None:
+        logger.error("Cannot plan tests: 'analysis' is missing from state.")
+        raise ValueError("Missing 'analysis' in GraphState for planning.")
+
     try:
-        llm = ChatOpenAI(model=MODEL, temperature=0)
-        prompt = load_prompt_template(prompt_name="test_planner")
-        planner_chain = prompt | llm.with_structured_output(TestSuite)
+        planner_chain = _planner_chain()
 
         # Prepare analysis data, ensuring it's in a string
         # format if needed by the prompt.
-        analysis_json = json.dumps(
+        analysis_json = orjson.dumps(
             {
-                "docstring": state["analysis"].get(
-                    "docstring", "No docstring provided."
-                ),
-                "signature": state["analysis"].get(
-                    "signature", "Unknown signature."
-                ),
+                "docstring": analysis.docstring or "No docstring provided.",
+                "signature": analysis.signature,
             },
-            indent=2,
-        )
+            option=orjson.OPT_INDENT_2,
+        ).decode()
 
         logger.debug(
             f"Invoking test planner with analysis: {analysis_json[:200]}..."
         )
 
-        # Invoke the chain with the necessary data from the state
-        test_plan: TestSuite = planner_chain.invoke(
+        # Invoke the chain with the necessary data from the state. The
+        # dict-schema binding returns a plain dict keyed by the field
+        # aliases; validate it into the model once here.
+        raw_plan = await _ainvoke_chain(
+            planner_chain,
             {
-                "function_code": state["function_code"],
+                "function_code": state.function_code,
                 "analysis": analysis_json,
+            },
+        )
+        storage_plan = TestSuite.model_validate(raw_plan)
+
+        # Decode each case's JSON-string inputs into the runnable
+        # models in one pass per category. Structured output
+        # guarantees well-formed cases, so no per-case try/except is
+        # needed; the enclosing try handles (and logs) the rare
+        # malformed payload.
+        test_plan = RunnableTestSuite.model_validate(
+            {
+                "Happy Path / Typical Cases": _runnable_cases(
+                    storage_plan.happy_path_cases
+                ),
+                "Edge Cases": _runnable_cases(storage_plan.edge_cases),
+                "Error Conditions / Invalid Input": _runnable_cases(
+                    storage_plan.error_conditions
+                ),
             }
         )
-
-        # Post-process the results to parse the
-        # 'inputs' string for each test case
-        for test_case_list in [
-            test_plan.happy_path_cases,
-            test_plan.edge_cases,
-            test_plan.error_conditions,
-        ]:
-            if not test_case_list:
-                continue
-            for test_case in test_case_list:
-                try:
-                    # Safely parse JSON inputs if needed
-                    if isinstance(test_case.inputs, str):
-                        test_case.inputs = json.loads(test_case.inputs)
-                    elif not isinstance(test_case.inputs, dict):
-                        logger.warning(
-                            f"Test case input for '{test_case}' "
-                            "is neither a string nor a dict, "
-                            "attempting to interpret as raw. Input: "
-                            f"{test_case.inputs}"
-                        )
-                except json.JSONDecodeError as e:
-                    logger.error(
-                        "Failed to decode JSON for test case "
-                        f"'{test_case}'"
-                        f" input: '{test_case.inputs}'. Error: {e}"
-                    )
-                    test_case.inputs = None
-                except Exception as e:
-                    logger.error(
-                        "An unexpected error occurred during JSON parsing for"
-                        f" test case '{test_case}': {e}",
-                        exc_info=True,
-                    )
-                    test_case.inputs = None
         logger.info(
             "Successfully generated test plan with"
             f"{len(test_plan.happy_path_cases)}"
@@ -273,11 +353,6 @@ def plan_tests(state: GraphState) -> GraphState:
             f" and {len(test_plan.error_conditions)} error test cases."
         )
 
-        # Return a new state dictionary to ensure
-        # immutability of the input state
-        updated_state: GraphState = state.copy()
-        updated_state["test_plan"] = test_plan
-
     except Exception as e:
         logger.error(
             f"An unexpected error occurred during test planning: {e}",
@@ -286,10 +361,11 @@ def plan_tests(state: GraphState) -> GraphState:
         # Re-raise as a Runtime Error or a more specific exception if known.
         raise RuntimeError("Failed to generate test plan.") from e
 
-    return updated_state
+    # Only the changed key is returned; LangGraph merges it in.
+    return {"test_plan": test_plan}
 
 
-def prepare_iteration(state: GraphState) -> GraphState:
+def prepare_iteration(state: GraphState) -> Dict[str, Any]:
     """Prepares for the next iteration of test generation by flattening test
     cases and initializing the accumulated test code with necessary imports.
 
@@ -306,20 +382,27 @@ def prepare_iteration(state: GraphState) -> GraphState:
             and `function_name`.
 
     Returns:
-        GraphState:
-            An updated state dictionary containing:
+        Dict[str, Any]:
+            The state keys updated by this node:
             - `test_cases_to_generate`: A flattened list of all test cases.
-            - `accumulated_test_code`: The initial code string with imports.
-            - `iteration_count`: Incremented by 1.
+            - `accumulated_test_code_parts`:
+                The code parts list seeded with the imports header.
 
     Raises:
+        ValueError: If `test_plan` is missing from the state.
         AttributeError:
             If expected attributes like `happy_path_cases` are missing
             from the `TestSuite` object.
     """
     logger.info("--- Executing Node: prepare_iteration ---")
 
-    test_suite: RunnableTestSuite = state["test_plan"]
+    # Narrow the Optional field populated by plan_tests.
+    test_suite = state.test_plan
+    if test_suite is None:
+        logger.error(
+            "Cannot prepare iteration: 'test_plan' is missing from state."
+        )
+        raise ValueError("Missing 'test_plan' in GraphState for iteration.")
 
     # Flatten all test cases into a single list for processing.
     # Safely access lists, providing empty lists if they are None or missing.
@@ -341,11 +424,12 @@ def prepare_iteration(state: GraphState) -> GraphState:
         f"{len(edge_cases)} edge, and {len(error_cases)}"
         " error test cases."
     )
-    # Prepare the initial code block with necessary imports
-    module_path = (
-        state["file_path"].replace(os.path.sep, ".").replace(".py", "")
+    # Prepare the initial code block with necessary imports, reusing
+    # the module path computed at graph entry.
+    module_path = state.module_path or _module_path(
+        state.file_path
     )
-    function_name = state["function_name"]
+    function_name = state.function_name
     initial_code = textwrap.dedent(
         f"""
         # -*- coding: utf-8 -*-
@@ -380,99 +464,129 @@ def prepare_iteration(state: GraphState) -> GraphState:
         f"'{function_name}' from module '{module_path}'."
     )
 
-    # Create a new state dictionary to maintain
-    # immutability of the input state.
-    updated_state: GraphState = state.copy()
-    updated_state["test_cases_to_generate"] = all_test_cases
-    updated_state["accumulated_test_code"] = initial_code
     logger.debug(
         "Iteration count for prepare_iteration node is now "
-        f"{updated_state['iteration_count']}."
+        f"{state.iteration_count}."
     )
 
-    return updated_state
+    # Only the changed keys are returned; LangGraph merges them in.
+    return {
+        "test_cases_to_generate": all_test_cases,
+        "accumulated_test_code_parts": [initial_code],
+    }
 
 
-def generate_single_test(state: GraphState) -> GraphState:
-    """Generates the code for a single test case from the queue.
+async def generate_all_tests(state: GraphState) -> Dict[str, Any]:
+    """Generates the code for every planned test case concurrently.
 
-    This function takes the first `TestCase` from the `test_cases_to_generate`
-    list, uses a language model to generate the corresponding Python test code,
-    and appends this new code to the `accumulated_test_code`. The state is
-    updated to reflect the shortened queue and the new accumulated code.
+    All test cases are independent of one another and the LLM calls are
+    purely I/O-bound, so this node issues one `ainvoke` per payload and
+    awaits them together with `asyncio.gather`, which preserves input
+    ordering. Generation latency is roughly that of the slowest single
+    call, and the generated snippets are appended to the
+    `accumulated_test_code_parts` in their original planning order.
 
     Args:
         state (GraphState):
             The current state of the graph, which must contain:
-            - `test_cases_to_generate`: A non-empty list of TestCase objects.
+            - `test_cases_to_generate`: The list of TestCase objects.
             - `function_name`: The name of the function under test.
-            - `analysis`: The analysis dictionary for the function.
-            - `accumulated_test_code`:
-                The string of already generated test code.
+            - `analysis`: The analysis details for the function.
+            - `accumulated_test_code_parts`:
+                The list of already generated test code snippets.
 
     Returns:
-        GraphState:
-            An updated state dictionary with:
-            - `test_cases_to_generate`:
-                The queue with the processed test case removed.
-            - `accumulated_test_code`:
-                The code string with the new test appended.
+        Dict[str, Any]:
+            The state keys updated by this node:
+            - `test_cases_to_generate`: Emptied once all cases are done.
+            - `accumulated_test_code_parts`:
+                The parts list with every generated test appended.
             - `current_test_case_json`:
-                The JSON representation of the processed test case.
-            - `iteration_count`: Incremented by 1.
+                The JSON representation of the last processed test case.
 
     Raises:
+        ValueError: If `analysis` is missing from the state.
         RuntimeError: If an error occurs during the language model invocation.
     """
-    logger.info("--- Executing Node: generate_single_test ---")
+    logger.info("--- Executing Node: generate_all_tests ---")
+
+    # Narrow the Optional field populated by analyze_function.
+    analysis = state.analysis
+    if analysis is None:
+        logger.error("Cannot generate tests: 'analysis' is missing.")
+        raise ValueError("Missing 'analysis' in GraphState for generation.")
+
     try:
-        # Create a mutable copy of the state to
-        # avoid side effects on the input object.
-        updated_state = state.copy()
-
-        # Pop the next test case to work on from the copied state's queue.
-        current_case = updated_state["test_cases_to_generate"].pop(0)
-        current_case_json = current_case.model_dump_json(indent=2)
-
-        # Use getattr for safer access to the description/name field.
-        test_case_name = getattr(
-            current_case,
-            "description",
-            getattr(current_case, "name", "Unnamed Test Case"),
-        )
-        logger.info(f"Generating test for: '{test_case_name}'")
-        logger.debug(f"Test case details (JSON):\n{current_case_json}")
+        test_cases = state.test_cases_to_generate
+        if not test_cases:
+            logger.warning("No test cases to generate; nothing to do.")
+            return {}
 
-        # Initialize LLM and construct the generation chain.
-        llm = ChatOpenAI(model=MODEL, temperature=0)
-        coder_chain = (
-            load_prompt_template("test_writer") | llm | StrOutputParser()
-        )
+        # Reuse the process-wide generation chain.
+        coder_chain = _coder_chain()
 
-        # Generate just the code for this one test.
-        logger.debug(
-            "Invoking coder chain with function details and test case..."
-        )
-        single_test_code = coder_chain.invoke(
+        # The analysis payload is identical for every case; build it once.
+        analysis_json = orjson.dumps(asdict(analysis)).decode()
+        payloads = [
             {
-                "function_name": updated_state["function_name"],
-                "test_case_json": current_case_json,
-                "analysis": json.dumps(
-                    updated_state["analysis"]
-                ),  # Ensure analysis is a string for the prompt
+                "function_name": state.function_name,
+                "test_case_json": test_case.as_json,
+                "analysis": analysis_json,
             }
-        )
-        logger.info("Successfully generated code for a single test case.")
+            for test_case in test_cases
+        ]
+
+        # Identical (prompt, analysis, test case) combinations are
+        # served from the content-addressed cache — re-runs and shared
+        # cases skip the LLM entirely.
+        keys = [
+            llm_cache.cache_key(
+                "test_writer",
+                payload["function_name"],
+                payload["test_case_json"],
+                payload["analysis"],
+            )
+            for payload in payloads
+        ]
+        generated_tests = [llm_cache.get(key) for key in keys]
+        misses = [
+            index
+            for index, snippet in enumerate(generated_tests)
+            if snippet is None
+        ]
 
-        # Append the new test function to our accumulated code.
-        updated_state[
-            "accumulated_test_code"
-        ] += f"\n\n{single_test_code.strip()}"
-        updated_state["current_test_case_json"] = current_case_json
+        logger.info(
+            f"Generating {len(misses)} tests concurrently "
+            f"({len(payloads) - len(misses)} cache hits)..."
+        )
+        fresh_tests = await asyncio.gather(
+            *(
+                _ainvoke_chain(coder_chain, payloads[index])
+                for index in misses
+            )
+        )
+        for index, snippet in zip(misses, fresh_tests):
+            generated_tests[index] = snippet
+            llm_cache.put(keys[index], snippet)
+        logger.info("Successfully generated code for all test cases.")
+
+        # Append the new test snippets to a fresh parts list, preserving
+        # the planner's ordering. The single join happens at
+        # finalization, keeping concatenation linear in output size.
+        # Every slot is filled at this point (cache hit or fresh call);
+        # the None filter narrows the Optional entries for the checker.
+        accumulated_parts = [
+            *state.accumulated_test_code_parts,
+            *(
+                snippet.strip()
+                for snippet in generated_tests
+                if snippet is not None
+            ),
+        ]
 
     except Exception as e:
         logger.error(
-            f"An unexpected error occurred during single test generation: {e}",
+            f"An unexpected error occurred during test generation: {e}",
             exc_info=True,
         )
         # Re-raise as a generic runtime error to
@@ -481,78 +595,50 @@ def generate_single_test(state: GraphState) -> GraphState:
             "Failed to generate test code due to an LLM or processing error."
         ) from e
 
-    return updated_state
+    # Only the changed keys are returned; LangGraph merges them in.
+    return {
+        "accumulated_test_code_parts": accumulated_parts,
+        "current_test_case_json": payloads[-1]["test_case_json"],
+        "test_cases_to_generate": [],
+    }
 
 
-def finalize_file(state: GraphState) -> GraphState:
-    """Finalizes the test code generation process by moving the accumulated
-    test code to the `generated_test_code` field in the state.
+def finalize_file(state: GraphState) -> Dict[str, Any]:
+    """Finalizes the test code generation process by joining the accumulated
+    test code parts into the `generated_test_code` field.
 
-    This node signifies the end of the test generation loop. It takes the
-    complete test code that has been built up (`accumulated_test_code`)
-    and places it into the `generated_test_code` field, which is typically
-    the final output of the test generation pipeline.
+    This node signifies the end of the test generation loop. It joins the
+    snippets built up in `accumulated_test_code_parts` with a single
+    `"\\n\\n".join` — one linear pass over the output — and places the
+    result into `generated_test_code`, the final output of the pipeline.
 
     Args:
         state (GraphState):
             The current state of the graph, containing the
-            `accumulated_test_code`.
+            `accumulated_test_code_parts`.
 
     Returns:
-        GraphState:
-            An updated state dictionary with `generated_test_code` populated.
+        Dict[str, Any]:
+            The populated `generated_test_code` key for the state.
 
      Raises:
-        ValueError: If `accumulated_test_code` is missing from the state.
+        ValueError: If `accumulated_test_code_parts` is missing from the
+            state.
     """
-    # Validate that the accumulated code exists
-    accumulated_code = state.get("accumulated_test_code")
-    if accumulated_code is None:
+    # Validate that the accumulated code parts exist
+    accumulated_parts = state.accumulated_test_code_parts
+    if accumulated_parts is None:
         logger.error(
-            "Cannot finalize file: 'accumulated_test_code'"
+            "Cannot finalize file: 'accumulated_test_code_parts'"
             " is missing from the state."
         )
         raise ValueError(
-            "Missing 'accumulated_test_code' in GraphState for finalization."
+            "Missing 'accumulated_test_code_parts' in GraphState for"
+            " finalization."
         )
 
-    # All tests have been generated, so we move the accumulated code to the
-    # final output field.
-    # Return a new state dictionary to maintain immutability.
-    updated_state: GraphState = state.copy()
-    updated_state["generated_test_code"] = accumulated_code
+    # All tests have been generated, so we join the parts into the final
+    # output field. Only the changed key is returned; LangGraph merges
+    # it in.
     logger.info("Test code finalized and moved to 'generated_test_code'.")
-    return updated_state
-
-
-def should_continue_generating(state: GraphState) -> str:
-    """Decides whether to continue the test generation loop or proceed to
-    finalization.
-
-    This function checks if there are any remaining test cases to be generated
-    as specified in the `GraphState`. If there are test cases left, it signals
-    to continue the generation process. Otherwise, it indicates that the
-    process is complete and finalization should occur.
-
-    Args:
-        state (GraphState): The current state of the graph analysis, containing
-                            the list of `test_cases_to_generate`.
-
-    Returns:
-        str: A decision string. Returns "continue_generation" if more tests
-             are pending, or "finalize" if all tests have been processed.
-    """
-    test_cases_list = state.get("test_cases_to_generate")
-
-    if test_cases_list is None:
-        logger.error("No test cases to generate.")
-        return "finalize"
-
-    if len(test_cases_list) > 0:
-        logger.info(
-            f"Remaining test cases: {len(test_cases_list)}. "
-            "Continuing generation loop."
-        )
-        return "continue_generation"
-    logger.info("No remaining test cases. Proceeding to finalization.")
-    return "finalize"
+    return {"generated_test_code": "\n\n".join(accumulated_parts)}
@@ -1,10 +1,12 @@
 """Functions relating to the loading and parsing of prompts."""
 
+from functools import lru_cache
 from pathlib import Path
 
 from langchain.prompts import ChatPromptTemplate
 
 
+@lru_cache(maxsize=32)
 def load_prompt_template(
     prompt_name: str, prompts_directory: str = "prompts"
 ) -> ChatPromptTemplate:
@@ -13,6 +15,10 @@ def load_prompt_template(
     This function follows a convention where the prompt file is expected
     to be located at `{prompts_directory}/{prompt_name}_prompt.md`.
 
+    Results are cached per (prompt_name, prompts_directory), so each
+    prompt file is read and compiled into a template exactly once per
+    process no matter how many chains are built from it.
+
     Args:
         prompt_name: The base name of the prompt (e.g., 'planner').
         prompts_directory: The directory where prompt files are stored.
@@ -1,8 +1,9 @@
 """Contains schemas used throughout code and as part of prompting."""
 
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 Primitive = Union[str, int, float, bool, None]
 
@@ -36,7 +37,15 @@ class ExpectedError(BaseModel):
 
 # Define the structure of a single test case
 class TestCaseBase(BaseModel):
-    """A single, self-contained test case."""
+    """A single, self-contained test case.
+
+    Test cases are never modified after construction, so the model (and
+    its subclasses, which inherit the config) is frozen. That makes the
+    serialized form stable, letting `as_json` be computed once and
+    cached rather than re-walking the model on every use.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     description: str = Field(
         ...,
@@ -50,6 +59,15 @@ class TestCaseBase(BaseModel):
         ),
     )
 
+    @cached_property
+    def as_json(self) -> str:
+        """The compact JSON form of this test case, serialized once.
+
+        Compact (no indent) on purpose: it is cheaper to produce and
+        consumes fewer prompt tokens when embedded in an LLM call.
+        """
+        return self.model_dump_json()
+
 
 class StorageTestCase(TestCaseBase):
     """A test case designed for serialization, where inputs are a JSON
@@ -102,6 +120,13 @@ class TestSuite(BaseModel):
     )
 
 
+# Derived once at import time: with_structured_output re-derives a JSON
+# schema from a Pydantic class on every binding, which walks all fields,
+# aliases and the outcome Union. Passing this precomputed dict instead
+# amortizes that introspection across every planning call.
+TEST_SUITE_SCHEMA: Dict[str, Any] = TestSuite.model_json_schema()
+
+
 class ImprovementDetail(BaseModel):
     """Describes a single specific issue found during the review and a
     suggestion to fix it."""
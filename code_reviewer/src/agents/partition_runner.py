@@ -0,0 +1,60 @@
+"""Concurrent fan-out of per-partition analysis work."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List
+
+from ..state import PartitionReport
+
+logger = logging.getLogger(__name__)
+
+# Each partition is analysed by its own LLM conversation, so total
+# latency is bounded by how many run at once rather than by their sum.
+# The cap keeps the fan-out inside typical API rate limits.
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+async def run_partitions(
+    partitions: Dict[str, List[str]],
+    analyze_partition: Callable[[str, List[str]], Awaitable[PartitionReport]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[PartitionReport]:
+    """Analyses every partition concurrently and collects the reports.
+
+    Partitions are independent of one another and partition analysis is
+    LLM-bound, so the coordinator should fan them out with this helper
+    instead of looping sequentially: all partitions are scheduled at
+    once and awaited together, with a semaphore capping how many are
+    in flight.
+
+    Args:
+        partitions: Mapping of partition id to the files it contains,
+            as produced by the master coordinator into
+            `CodebaseState.partitions`.
+        analyze_partition: Coroutine function taking a partition id and
+            its file list and returning that partition's report.
+        max_concurrency: Maximum number of partitions analysed at the
+            same time.
+
+    Returns:
+        One PartitionReport per partition, in the partitions' iteration
+        order regardless of completion order; suitable for assignment
+        to `CodebaseState.partition_reports`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(
+        partition_id: str, files: List[str]
+    ) -> PartitionReport:
+        async with semaphore:
+            logger.info("Analyzing partition '%s'...", partition_id)
+            return await analyze_partition(partition_id, files)
+
+    return list(
+        await asyncio.gather(
+            *(
+                bounded(partition_id, files)
+                for partition_id, files in partitions.items()
+            )
+        )
+    )
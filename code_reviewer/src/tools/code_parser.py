@@ -1,18 +1,105 @@
 """Tools for pasring out python files."""
 
 import ast
+import hashlib
+import mmap
 import os
-from typing import Any, Dict, List, Tuple
+import pickle
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Persistent cache of file summaries keyed by content hash, so re-runs
+# only pay the ast.parse cost for files that actually changed.
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dev-toolbox")
+_CACHE_PATH = os.path.join(_CACHE_DIR, "ast.sqlite")
+# pylint: disable-next=invalid-name
+_cache_connection: Optional[sqlite3.Connection] = None
+
+# Files above this size are almost always generated or vendored code
+# and would dominate both memory use and parse time; they are skipped
+# and flagged in their summary instead.
+_MAX_FILE_SIZE = 2_000_000
+
+
+def _summary_cache() -> Optional[sqlite3.Connection]:
+    """Returns this process's connection to the on-disk summary cache.
+
+    The connection is opened lazily so each worker in a process pool
+    gets its own handle. Returns None when the cache cannot be opened
+    (e.g. a read-only home directory); parsing then proceeds uncached.
+    """
+    global _cache_connection  # pylint: disable=global-statement
+    if _cache_connection is None:
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            connection = sqlite3.connect(_CACHE_PATH, timeout=5.0)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS summaries "
+                "(file_hash TEXT PRIMARY KEY, summary BLOB)"
+            )
+            connection.commit()
+            _cache_connection = connection
+        except (OSError, sqlite3.Error):
+            return None
+    return _cache_connection
+
+
+def _cached_summary(file_hash: str) -> Optional[Dict[str, Any]]:
+    """Looks up a previously stored summary for the given content hash."""
+    cache = _summary_cache()
+    if cache is None:
+        return None
+    try:
+        row = cache.execute(
+            "SELECT summary FROM summaries WHERE file_hash = ?",
+            (file_hash,),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return pickle.loads(row[0]) if row else None
+
+
+def _store_summary(file_hash: str, summary: Dict[str, Any]) -> None:
+    """Persists a summary under its content hash; failures are ignored."""
+    cache = _summary_cache()
+    if cache is None:
+        return
+    try:
+        cache.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?)",
+            (file_hash, pickle.dumps(summary)),
+        )
+        cache.commit()
+    except sqlite3.Error:
+        pass
+
+
+def iter_python_files(directory: str) -> Iterator[str]:
+    """Lazily yield all Python files under a directory.
+
+    Built on os.scandir, whose directory entries carry the file type
+    from the listing itself, so no extra stat call or intermediate path
+    lists are needed and consumers can start work before the walk has
+    finished. Unreadable directories are skipped, matching os.walk's
+    default error tolerance, so one bad permission bit cannot abort the
+    whole discovery pass.
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_python_files(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
 
 
 def get_python_files(directory: str) -> List[str]:
     """Recursively find all Python files in a directory."""
-    python_files = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".py"):
-                python_files.append(os.path.join(root, file))
-    return python_files
+    return list(iter_python_files(directory))
 
 
 def parse_file_ast(file_path: str) -> Tuple[str, Dict[str, Any]]:
@@ -21,30 +108,75 @@ def parse_file_ast(file_path: str) -> Tuple[str, Dict[str, Any]]:
     This is a "tool" our agents can call.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
+        # Read raw bytes: ast.parse accepts them directly (honouring the
+        # PEP 263 coding cookie), the hash wants bytes anyway, and the
+        # decode to str happens once at the end for the caller. Large
+        # files are memory-mapped so the content is hashed straight out
+        # of the OS page cache, which persists across repeated runs.
+        with open(file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size > _MAX_FILE_SIZE:
+                return "", {"file_path": file_path, "skipped": True}
+            if size == 0:
+                content_bytes = b""
+                file_hash = hashlib.blake2b(content_bytes).hexdigest()
+            else:
+                with mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+                    file_hash = hashlib.blake2b(mapped).hexdigest()
+                    content_bytes = bytes(mapped)
+
+        # An unchanged file (same content hash) reuses the summary from
+        # a previous run and skips the parse entirely.
+        cached = _cached_summary(file_hash)
+        if cached is not None:
+            cached["file_path"] = file_path
+            return content_bytes.decode("utf-8"), cached
 
-        parsed_ast = ast.parse(content)
+        parsed_ast = ast.parse(content_bytes, filename=file_path)
+
+        # Collect everything in a single walk rather than one traversal
+        # per summary field. Exact type comparisons are a C-level
+        # pointer check, these node classes have no subclasses we care
+        # about here, and the inline form lets type checkers narrow
+        # `node` in each branch.
+        imports: List[str] = []
+        functions: List[str] = []
+        classes: List[str] = []
+        for node in ast.walk(parsed_ast):
+            # pylint: disable=unidiomatic-typecheck
+            if type(node) is ast.Import or type(node) is ast.ImportFrom:
+                imports.extend(alias.name for alias in node.names)
+            elif type(node) is ast.FunctionDef:
+                functions.append(node.name)
+            elif type(node) is ast.ClassDef:
+                classes.append(node.name)
 
         summary = {
             "file_path": file_path,
-            "imports": [
-                node.names[0].name
-                for node in ast.walk(parsed_ast)
-                if isinstance(node, ast.Import)
-            ],
-            "functions": [
-                node.name
-                for node in ast.walk(parsed_ast)
-                if isinstance(node, ast.FunctionDef)
-            ],
-            "classes": [
-                node.name
-                for node in ast.walk(parsed_ast)
-                if isinstance(node, ast.ClassDef)
-            ],
+            "imports": imports,
+            "functions": functions,
+            "classes": classes,
             "docstring": ast.get_docstring(parsed_ast) is not None,
         }
-        return content, summary
+        _store_summary(file_hash, summary)
+        return content_bytes.decode("utf-8"), summary
     except Exception as e:
         return "", {"error": str(e), "file_path": file_path}
+
+
+def parse_all_files(directory: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Parses every Python file under a directory in parallel.
+
+    Each file's read-plus-parse is independent work, so the file list is
+    fanned out across a process pool and parsing scales with available
+    cores. Chunking amortizes the inter-process transfer cost when the
+    repository contains many small files.
+    """
+    with ProcessPoolExecutor() as executor:
+        return list(
+            executor.map(
+                parse_file_ast, get_python_files(directory), chunksize=8
+            )
+        )